@@ -0,0 +1,103 @@
+import hashlib
+import json
+import mmap
+import os
+import stat
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+CACHE_DIR = ROOT_DIR / ".cache"
+HASH_CACHE_PATH = CACHE_DIR / "hashes.json"
+MMAP_THRESHOLD = 64 * 1024
+# Files touched this recently are not cached: a same-size rewrite inside the
+# filesystem's mtime granularity would otherwise hit a stale digest.
+RACY_WINDOW_NS = 1_000_000_000
+
+
+def load_cache(path: Path):
+    try:
+        with path.open("r", encoding="utf-8") as handle:
+            data = json.load(handle)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def save_cache(path: Path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with tmp_path.open("w", encoding="utf-8") as handle:
+        json.dump(data, handle)
+    os.replace(tmp_path, path)
+
+
+_HASH_CACHE = load_cache(HASH_CACHE_PATH)
+_hash_cache_dirty = False
+
+
+def _compute_sha256(path: Path):
+    # file_digest hands the whole read loop to OpenSSL, which uses SHA-NI where available.
+    if hasattr(hashlib, "file_digest"):
+        with path.open("rb") as handle:
+            return hashlib.file_digest(handle, "sha256").hexdigest()
+    if path.stat().st_size < MMAP_THRESHOLD:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    h = hashlib.sha256()
+    with path.open("rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        h.update(memoryview(mm))
+    return h.hexdigest()
+
+
+def sha256_file(path: Path, st=None):
+    global _hash_cache_dirty
+    if st is None:
+        st = path.stat()
+    key = str(path)
+    cached = _HASH_CACHE.get(key)
+    if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
+    digest = _compute_sha256(path)
+    if time.time_ns() - st.st_mtime_ns > RACY_WINDOW_NS:
+        _HASH_CACHE[key] = [st.st_mtime_ns, st.st_size, digest]
+        _hash_cache_dirty = True
+    return digest
+
+
+def save_hash_cache():
+    global _hash_cache_dirty
+    if not _hash_cache_dirty:
+        return
+    try:
+        save_cache(HASH_CACHE_PATH, _HASH_CACHE)
+    except OSError:
+        return
+    _hash_cache_dirty = False
+
+
+def stat_regular_file(path):
+    try:
+        st = os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    return st if stat.S_ISREG(st.st_mode) else None
+
+
+def collect_registry_hashes(manifest):
+    rels = []
+    paths = []
+    stats = []
+    for entry in manifest.get("required_files", []):
+        rel = entry.get("path")
+        if not rel or not rel.startswith("registry/"):
+            continue
+        p = ROOT_DIR / rel
+        st = stat_regular_file(p)
+        if st is not None:
+            rels.append(rel)
+            paths.append(p)
+            stats.append(st)
+    # Keep manifest order so the metadata JSON stays stable across runs.
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        return dict(zip(rels, executor.map(sha256_file, paths, stats)))
@@ -0,0 +1,63 @@
+import json
+import os
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_CACHE = {}
+
+
+def load_json(path):
+    if orjson is not None:
+        return orjson.loads(Path(path).read_bytes())
+    with open(path, "rb") as handle:
+        return json.load(handle)
+
+
+def load_json_cached(path):
+    # Returned objects are shared between callers, so only use this for reads.
+    real_path = os.path.realpath(path)
+    st = os.stat(real_path)
+    key = (st.st_mtime_ns, st.st_size)
+    cached = _CACHE.get(real_path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    data = load_json(real_path)
+    _CACHE[real_path] = (key, data)
+    return data
+
+
+def dump_json(data):
+    # Both paths write 2-space indent, raw UTF-8 and a trailing newline, but they
+    # are not byte-identical for every input: floats below 1e-4 (orjson writes
+    # 1e-7 and 0.00001 where json writes 1e-07 and 1e-05), NaN/Infinity (orjson
+    # writes null) and integers outside the 64-bit range (orjson raises TypeError).
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(data, indent=2, separators=(",", ": "), ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def save_json(path, data):
+    _CACHE.pop(os.path.realpath(path), None)
+    if orjson is not None:
+        Path(path).write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
+        return
+    with open(path, "w", encoding="utf-8", newline="\n") as handle:
+        json.dump(data, handle, indent=2, separators=(",", ": "), ensure_ascii=False)
+        handle.write("\n")
+
+
+def save_json_if_changed(path, data):
+    # Leaving identical files untouched keeps their mtime, and every mtime-keyed cache, valid.
+    payload = dump_json(data)
+    try:
+        if Path(path).read_bytes() == payload:
+            return False
+    except FileNotFoundError:
+        pass
+    _CACHE.pop(os.path.realpath(path), None)
+    Path(path).write_bytes(payload)
+    return True
@@ -0,0 +1,18 @@
+import importlib.util
+import sys
+from pathlib import Path
+
+BIN_DIR = Path(__file__).resolve().parent
+
+
+def load_script(name):
+    # bin/ scripts use hyphenated file names, so they are loaded by path.
+    module_name = name.replace("-", "_")
+    module = sys.modules.get(module_name)
+    if module is not None:
+        return module
+    spec = importlib.util.spec_from_file_location(module_name, BIN_DIR / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
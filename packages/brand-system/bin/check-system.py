@@ -35,8 +35,9 @@ def main():
         return
 
     diff = subprocess.run(
-        ["git", "diff", "--exit-code", "--", "packages/brand-system"],
+        ["git", "diff", "--quiet", "--exit-code", "--", "packages/brand-system"],
         cwd=repo_root,
+        env={**os.environ, "GIT_OPTIONAL_LOCKS": "0", "LC_ALL": "C"},
     )
     if diff.returncode != 0:
         print("Brand system outputs out of sync. Commit regenerated files.")
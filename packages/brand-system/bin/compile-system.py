@@ -1,38 +1,14 @@
 #!/usr/bin/env python3
 import argparse
-import hashlib
-import json
 import os
-import subprocess
 from datetime import datetime, timezone
 from pathlib import Path
 
-ROOT_DIR = Path(__file__).resolve().parents[1]
-
-
-def load_json(path: Path):
-    with path.open("r", encoding="utf-8") as handle:
-        return json.load(handle)
-
+from _hashutil import collect_registry_hashes, save_hash_cache, sha256_file
+from _jsonio import load_json
+from _scripts import load_script
 
-def sha256_file(path: Path):
-    h = hashlib.sha256()
-    with path.open("rb") as handle:
-        for chunk in iter(lambda: handle.read(8192), b""):
-            h.update(chunk)
-    return h.hexdigest()
-
-
-def collect_registry_hashes(manifest):
-    hashes = {}
-    for entry in manifest.get("required_files", []):
-        rel = entry.get("path")
-        if not rel or not rel.startswith("registry/"):
-            continue
-        p = ROOT_DIR / rel
-        if p.exists() and p.is_file():
-            hashes[rel] = sha256_file(p)
-    return hashes
+ROOT_DIR = Path(__file__).resolve().parents[1]
 
 
 def find_existing_generated_at(manifest):
@@ -52,13 +28,16 @@ def find_existing_generated_at(manifest):
     return None
 
 
-def run_script(script_path):
-    subprocess.run(["python3", str(ROOT_DIR / script_path)], check=True)
-
-
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--generated-at", dest="generated_at", default=None)
+    parser.add_argument(
+        "--reuse-generated-at",
+        dest="reuse_generated_at",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="keep generated_at from existing outputs so unchanged inputs compile byte-identically",
+    )
     args = parser.parse_args()
 
     os.chdir(ROOT_DIR)
@@ -68,54 +47,45 @@ def main():
     compiler_spec_id = compiler_spec.get("id", "COMPILER_SPEC_V1")
 
     manifest = load_json(ROOT_DIR / "registry/system-manifest.json")
-    existing_generated_at = find_existing_generated_at(manifest)
 
     generated_at = args.generated_at
+    if not generated_at and args.reuse_generated_at:
+        generated_at = find_existing_generated_at(manifest)
     if not generated_at:
-        generated_at = existing_generated_at or datetime.now(timezone.utc).isoformat()
+        generated_at = datetime.now(timezone.utc).isoformat()
 
-    # pipeline: sync defs + generate sections + generate outputs
-    run_script("bin/sync-defs.py")
-    run_script("bin/generate-sections.py")
-    run_script("bin/generate-outputs.py")
+    # pipeline: sync defs + generate sections
+    load_script("sync-defs").main([])
+    load_script("generate-sections").main()
 
-    # compute hashes
+    # compute hashes once sections.json is regenerated
     seed_hash = sha256_file(ROOT_DIR / "brand-seed.json")
     registry_hashes = collect_registry_hashes(manifest)
+    save_hash_cache()
 
-    # apply metadata to outputs
-    for entry in manifest.get("expected_outputs", []):
-        output_path = ROOT_DIR / entry["path"]
-        if not output_path.exists():
-            raise FileNotFoundError(f"Missing expected output: {entry['path']}")
-        data = load_json(output_path)
-
-        # find top-level layer object key
-        layer_keys = [k for k in data.keys() if k != "metadata"]
-        if not layer_keys:
-            raise ValueError(f"Output missing layer object: {entry['path']}")
-        layer_key = layer_keys[0]
-        layer = data[layer_key]
-        source_sections = []
-        if isinstance(layer, dict):
-            derivation_log = layer.get("derivation_log", {})
-            source_sections = derivation_log.get("source_sections", [])
-
-        data["metadata"] = {
+    # generate outputs with metadata attached
+    generated = load_script("generate-outputs").main(
+        metadata_base={
             "seed_hash": seed_hash,
             "registry_hashes": registry_hashes,
             "compiler_version": compiler_version,
             "compiler_spec_id": compiler_spec_id,
             "generated_at": generated_at,
-            "source_sections": source_sections or ["SECTION_ORCH_THEPERSUASIONOPERATINGSYSTEM"],
         }
-
-        output_path.write_text(json.dumps(data, indent=2) + "\n")
+    )
+    # only generated files carry metadata, so the two sets must match exactly
+    expected = {entry["path"] for entry in manifest.get("expected_outputs", [])}
+    missing = sorted(expected - set(generated))
+    unexpected = sorted(set(generated) - expected)
+    if missing or unexpected:
+        raise ValueError(
+            f"Generated outputs do not match expected_outputs (not generated: {missing}, not in manifest: {unexpected})"
+        )
 
     # validate system + consistency + audit
-    run_script("bin/validate-system.py")
-    run_script("bin/validate-consistency.py")
-    run_script("bin/audit-system.py")
+    load_script("validate-system").main()
+    load_script("validate-consistency").main()
+    load_script("audit-system").main(manifest=manifest, compiler_spec=compiler_spec)
 
     print("Compilation complete.")
 
@@ -1,32 +1,29 @@
 #!/usr/bin/env python3
-import json
 import os
 import re
+from functools import partial
 from pathlib import Path
 
+from _jsonio import load_json, save_json
+
 ROOT_DIR = Path(__file__).resolve().parents[1]
 TEMPLATE_DIR = ROOT_DIR / "templates" / "outputs"
 OUTPUT_DIR = ROOT_DIR / "outputs"
-
-
-def load_json(path: Path):
-    with path.open("r", encoding="utf-8") as handle:
-        return json.load(handle)
-
-
-def save_json(path: Path, data):
-    path.write_text(json.dumps(data, indent=2) + "\n")
+DEFAULT_SOURCE_SECTIONS = ["SECTION_ORCH_THEPERSUASIONOPERATINGSYSTEM"]
+WORD_RE = re.compile(r"[a-z]+")
+LF8_PAIN_TOKENS = frozenset({"pain", "hurt", "ache", "burn", "injury", "injured", "sore"})
+LF8_PROTECT_TOKENS = frozenset({"safe", "safety", "protect", "protection"})
 
 
 def words_from(text):
-    return [w.lower() for w in re.findall(r"[A-Za-z]+", text)]
+    return WORD_RE.findall((text or "").lower())
 
 
 def lf8_from_pain(pain_statement):
     tokens = set(words_from(pain_statement or ""))
-    if tokens & {"pain", "hurt", "ache", "burn", "injury", "injured", "sore"}:
+    if tokens & LF8_PAIN_TOKENS:
         return "LF8_PAIN_FREEDOM", "LF8_COMFORT", "LF8_PROTECTION"
-    if tokens & {"safe", "safety", "protect", "protection"}:
+    if tokens & LF8_PROTECT_TOKENS:
         return "LF8_PROTECTION", "LF8_SURVIVAL", None
     return "LF8_COMFORT", "LF8_PROTECTION", None
 
@@ -70,7 +67,7 @@ def generate_manifesto(template, seed):
     return template
 
 
-def generate_covenant(template, seed):
+def generate_covenant(template, seed, ladder):
     cov = template["covenant"]
     market = seed.get("market_evidence", {})
     founder = seed.get("founder_assets", {})
@@ -123,7 +120,7 @@ def generate_covenant(template, seed):
     cov["grand_slam_offer"] = offer
 
     # value ladder
-    cov["value_ladder"] = build_value_ladder(seed)
+    cov["value_ladder"] = ladder
 
     # attractive character
     cov["attractive_character"] = {
@@ -184,9 +181,8 @@ def generate_choreography(template, seed):
     return template
 
 
-def generate_storefront(template, seed):
+def generate_storefront(template, seed, ladder, stack):
     store = template["storefront"]
-    stack = load_json(ROOT_DIR / "registry/stack/headless-commerce-stack.json")
     stack_id = stack["stacks"][0]["id"]
     store["artifact_architecture"]["type_specification"]["technical_stack_id"] = stack_id
     store["artifact_architecture"]["type_specification"]["technical_stack"] = (
@@ -194,7 +190,6 @@ def generate_storefront(template, seed):
         "Whop Embedded Checkout + Resend + Shopify Admin API (fulfillment only)"
     )
 
-    ladder = build_value_ladder(seed)
     offer_map = {item["rung_id"]: item["offer"] for item in ladder}
     price_map = {item["rung_id"]: item["price"] for item in ladder}
     ladder_map = {
@@ -218,19 +213,37 @@ def generate_storefront(template, seed):
     return template
 
 
-def generate_outputs():
+def attach_metadata(data, metadata_base, label):
+    layer_key = next((k for k in data if k != "metadata"), None)
+    if layer_key is None:
+        raise ValueError(f"Output missing layer object: {label}")
+    layer = data[layer_key]
+    source_sections = []
+    if isinstance(layer, dict):
+        derivation_log = layer.get("derivation_log", {})
+        source_sections = derivation_log.get("source_sections", [])
+    data["metadata"] = {
+        **metadata_base,
+        "source_sections": source_sections or DEFAULT_SOURCE_SECTIONS,
+    }
+
+
+def generate_outputs(metadata_base=None):
     seed = load_json(ROOT_DIR / "brand-seed.json")
+    ladder = build_value_ladder(seed)
+    stack = load_json(ROOT_DIR / "registry/stack/headless-commerce-stack.json")
 
     generators = {
         "manifesto.template.json": generate_manifesto,
-        "covenant.template.json": generate_covenant,
+        "covenant.template.json": partial(generate_covenant, ladder=ladder),
         "sumi-breath.template.json": lambda t, s: t,
         "tradeoff-ladder.template.json": lambda t, s: t,
         "canon.template.json": generate_canon,
         "choreography.template.json": generate_choreography,
-        "storefront.template.json": generate_storefront,
+        "storefront.template.json": partial(generate_storefront, ladder=ladder, stack=stack),
     }
 
+    written = []
     for template_file, fn in generators.items():
         template_path = TEMPLATE_DIR / template_file
         if not template_path.exists():
@@ -238,13 +251,18 @@ def generate_outputs():
         template = load_json(template_path)
         data = fn(template, seed)
         output_name = template_file.replace('.template', '')
+        if metadata_base is not None:
+            attach_metadata(data, metadata_base, f"outputs/{output_name}")
         save_json(OUTPUT_DIR / output_name, data)
+        written.append(f"outputs/{output_name}")
+    return written
 
 
-def main():
+def main(metadata_base=None):
     os.chdir(ROOT_DIR)
-    generate_outputs()
+    written = generate_outputs(metadata_base)
     print("Outputs generated from templates.")
+    return written
 
 
 if __name__ == "__main__":
@@ -1,21 +1,31 @@
 #!/usr/bin/env python3
-import json
+import functools
+import hashlib
 import os
-from glob import glob
+import time
 from pathlib import Path
 
-from section_utils import HEADING_RE, compute_section_id, get_anchor_id, is_anchor_line
+from _hashutil import CACHE_DIR, RACY_WINDOW_NS, load_cache, save_cache
+from _jsonio import load_json, save_json
+from section_utils import HEADING_RE, get_anchor_id
+from section_utils import compute_section_id as _compute_section_id
 
 ROOT_DIR = Path(__file__).resolve().parents[1]
+SECTIONS_CACHE_PATH = CACHE_DIR / "sections.json"
+# Cached sections are only valid for the parsing code that produced them.
+SECTIONS_CACHE_VERSION = hashlib.sha256(
+    (ROOT_DIR / "bin" / "section_utils.py").read_bytes() + Path(__file__).read_bytes()
+).hexdigest()
+
+compute_section_id = functools.lru_cache(maxsize=None)(_compute_section_id)
 
 
 def load_existing_order(registry_path):
     if not os.path.exists(registry_path):
         return []
     try:
-        with open(registry_path, "r", encoding="utf-8") as handle:
-            data = json.load(handle)
-    except (OSError, json.JSONDecodeError):
+        data = load_json(registry_path)
+    except (OSError, ValueError):
         return []
     order = []
     for entry in data.get("sections", []):
@@ -26,12 +36,22 @@ def load_existing_order(registry_path):
 
 
 def list_doc_files():
-    docs = sorted(glob("docs/*.md"))
+    try:
+        with os.scandir("docs") as entries:
+            docs = sorted(
+                entry.path
+                for entry in entries
+                if entry.name.endswith(".md") and not entry.name.startswith(".") and entry.is_file()
+            )
+    except FileNotFoundError:
+        return []
     if not docs:
         return []
     registry_order = load_existing_order("registry/sections.json")
-    ordered = [path for path in registry_order if path in docs]
-    remaining = [path for path in docs if path not in ordered]
+    docs_set = set(docs)
+    ordered = [path for path in registry_order if path in docs_set]
+    ordered_set = set(ordered)
+    remaining = [path for path in docs if path not in ordered_set]
     return ordered + remaining
 
 
@@ -42,54 +62,41 @@ def update_doc_anchors(path):
     new_lines = []
     sections = []
     in_code = False
+    last_non_empty = -1
 
     for line in lines:
         if line.startswith("```"):
             in_code = not in_code
-            new_lines.append(line)
-            continue
-        if in_code:
-            new_lines.append(line)
-            continue
-        match = HEADING_RE.match(line)
-        if match:
-            level = len(match.group(1))
-            heading_text = match.group(2).strip()
-
-            last_non_empty = len(new_lines) - 1
-            while last_non_empty >= 0 and new_lines[last_non_empty].strip() == "":
-                last_non_empty -= 1
-
-            existing_anchor_id = None
-            if last_non_empty >= 0 and is_anchor_line(new_lines[last_non_empty]):
-                existing_anchor_id = get_anchor_id(new_lines[last_non_empty])
-
-            if existing_anchor_id:
-                section_id = existing_anchor_id
-                anchor_line = new_lines[last_non_empty].strip()
-            else:
-                section_id = compute_section_id(path, heading_text)
-                anchor_line = f"<a id=\"{section_id}\"></a>"
-
-            if last_non_empty >= 0 and is_anchor_line(new_lines[last_non_empty]):
-                del new_lines[last_non_empty + 1 :]
-                if not existing_anchor_id and new_lines[last_non_empty].strip() != anchor_line:
-                    new_lines[last_non_empty] = anchor_line
-            else:
-                new_lines.append(anchor_line)
-
-            new_lines.append(line)
-            sections.append(
-                {
-                    "id": section_id,
-                    "file": path,
-                    "heading": heading_text,
-                    "level": level,
-                }
-            )
-            continue
+        elif not in_code:
+            match = HEADING_RE.match(line)
+            if match:
+                level = len(match.group(1))
+                heading_text = match.group(2).strip()
+
+                anchor_id = None
+                if last_non_empty >= 0:
+                    anchor_id = get_anchor_id(new_lines[last_non_empty])
+
+                if anchor_id:
+                    section_id = anchor_id
+                    # drop blank lines between the anchor and its heading
+                    del new_lines[last_non_empty + 1 :]
+                else:
+                    section_id = compute_section_id(path, heading_text)
+                    new_lines.append(f"<a id=\"{section_id}\"></a>")
+
+                sections.append(
+                    {
+                        "id": section_id,
+                        "file": path,
+                        "heading": heading_text,
+                        "level": level,
+                    }
+                )
 
         new_lines.append(line)
+        if line.strip():
+            last_non_empty = len(new_lines) - 1
 
     original = "\n".join(lines) + "\n"
     updated = "\n".join(new_lines) + "\n"
@@ -100,12 +107,38 @@ def update_doc_anchors(path):
     return sections
 
 
+def cached_doc_sections(path, cache):
+    st = os.stat(path)
+    entry = cache.get(path)
+    if entry and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+        return entry[2], False
+    sections = update_doc_anchors(path)
+    st = os.stat(path)
+    if time.time_ns() - st.st_mtime_ns > RACY_WINDOW_NS:
+        cache[path] = [st.st_mtime_ns, st.st_size, sections]
+    else:
+        cache.pop(path, None)
+    return sections, True
+
+
 def main():
     os.chdir(ROOT_DIR)
     doc_files = list_doc_files()
+    stored = load_cache(SECTIONS_CACHE_PATH)
+    cache = stored.get("docs") if stored.get("version") == SECTIONS_CACHE_VERSION else None
+    if not isinstance(cache, dict):
+        cache = {}
+    cache_updated = False
     sections = []
     for path in doc_files:
-        sections.extend(update_doc_anchors(path))
+        doc_sections, updated = cached_doc_sections(path, cache)
+        sections.extend(doc_sections)
+        cache_updated = cache_updated or updated
+    if cache_updated:
+        try:
+            save_cache(SECTIONS_CACHE_PATH, {"version": SECTIONS_CACHE_VERSION, "docs": cache})
+        except OSError:
+            pass
 
     registry = {
         "$schema": "http://json-schema.org/draft-07/schema#",
@@ -120,9 +153,7 @@ def main():
     }
 
     os.makedirs("registry", exist_ok=True)
-    with open("registry/sections.json", "w", encoding="utf-8") as handle:
-        json.dump(registry, handle, indent=2)
-        handle.write("\n")
+    save_json("registry/sections.json", registry)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+import sys
+
+from _scripts import BIN_DIR, load_script
+
+# validate-system already runs validate-sections and seed-sufficiency.
+VALIDATORS = (
+    "validate-seed",
+    "validate-system",
+    "validate-consistency",
+    "audit-system",
+)
+
+
+def run_validator(name):
+    argv = sys.argv
+    sys.argv = [str(BIN_DIR / f"{name}.py")]
+    try:
+        load_script(name).main()
+    except SystemExit as exc:
+        return exc.code in (None, 0)
+    finally:
+        sys.argv = argv
+    return True
+
+
+def main():
+    failed = [name for name in VALIDATORS if not run_validator(name)]
+    if failed:
+        print(f"Validators failed: {', '.join(failed)}")
+        sys.exit(1)
+    print("All validators passed.")
+
+
+if __name__ == "__main__":
+    main()
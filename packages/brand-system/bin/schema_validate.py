@@ -1,9 +1,10 @@
 #!/usr/bin/env python3
-import json
 import os
 import re
 import sys
 from pathlib import Path
+from urllib.parse import urlparse
+from urllib.request import url2pathname
 
 try:
     import jsonschema
@@ -12,12 +13,29 @@ except Exception:
     jsonschema = None
     Draft7Validator = None
 
+try:
+    import fastjsonschema
+except Exception:
+    fastjsonschema = None
+
+from _jsonio import load_json
+
 SCHEMA_CACHE = {}
+VALIDATOR_CACHE = {}
+REF_CACHE = {}
+
 
+class FirstError(Exception):
+    pass
 
-def load_json(path):
-    with open(path, "r", encoding="utf-8") as handle:
-        return json.load(handle)
+
+class FailFastErrors(list):
+    # Error sink for yes/no checks: the first reported error aborts validation.
+    def append(self, error):
+        raise FirstError
+
+
+FAIL_FAST = FailFastErrors()
 
 
 def resolve_pointer(schema, pointer):
@@ -39,15 +57,27 @@ def resolve_pointer(schema, pointer):
 
 def resolve_ref(ref, base_dir, root_schema):
     if ref.startswith("#"):
-        return resolve_pointer(root_schema, ref), base_dir, root_schema
+        # Each entry holds its root schema, so the id() in the key cannot be reused while cached.
+        key = (id(root_schema), base_dir, ref)
+        resolved = REF_CACHE.get(key)
+        if resolved is None:
+            resolved = (resolve_pointer(root_schema, ref), base_dir, root_schema)
+            REF_CACHE[key] = resolved
+        return resolved
 
     file_part, _, pointer = ref.partition("#")
     file_path = os.path.normpath(os.path.join(base_dir, file_part))
+    key = (file_path, pointer)
+    resolved = REF_CACHE.get(key)
+    if resolved is not None:
+        return resolved
     if file_path not in SCHEMA_CACHE:
         SCHEMA_CACHE[file_path] = load_json(file_path)
     schema = SCHEMA_CACHE[file_path]
     target = resolve_pointer(schema, f"#{pointer}" if pointer else "#")
-    return target, os.path.dirname(file_path), schema
+    resolved = (target, os.path.dirname(file_path), schema)
+    REF_CACHE[key] = resolved
+    return resolved
 
 
 def type_matches(instance, expected):
@@ -68,109 +98,316 @@ def type_matches(instance, expected):
     return False
 
 
-def validate(instance, schema, base_dir, root_schema, path="$"):
-    errors = []
+def compile_type_check(expected_type):
+    expected = expected_type if isinstance(expected_type, list) else [expected_type]
+
+    def check(instance, path, errors):
+        for item in expected:
+            if type_matches(instance, item):
+                return False
+        errors.append(f"{path}: expected type {expected_type}")
+        return True
+
+    return check
+
+
+def compile_enum_check(values):
+    try:
+        members = frozenset(values)
+    except TypeError:
+        members = None
+
+    def check(instance, path, errors):
+        if members is not None:
+            try:
+                if instance in members:
+                    return False
+            except TypeError:
+                pass
+        if instance not in values:
+            errors.append(f"{path}: value {instance!r} not in enum")
+        return False
+
+    return check
+
+
+def compile_string_checks(schema):
+    checks = []
+    min_length = schema.get("minLength")
+    if min_length is not None:
+        def check_min_length(instance, path, errors):
+            if len(instance) < min_length:
+                errors.append(f"{path}: string length < {min_length}")
+
+        checks.append(check_min_length)
+    pattern = schema.get("pattern")
+    if pattern:
+        search = re.compile(pattern).search
 
+        def check_pattern(instance, path, errors):
+            if search(instance) is None:
+                errors.append(f"{path}: string does not match pattern {pattern!r}")
+
+        checks.append(check_pattern)
+    return checks
+
+
+def compile_number_checks(schema):
+    checks = []
+    minimum = schema.get("minimum")
+    if minimum is not None:
+        def check_minimum(instance, path, errors):
+            if instance < minimum:
+                errors.append(f"{path}: value {instance} < minimum {minimum}")
+
+        checks.append(check_minimum)
+    maximum = schema.get("maximum")
+    if maximum is not None:
+        def check_maximum(instance, path, errors):
+            if instance > maximum:
+                errors.append(f"{path}: value {instance} > maximum {maximum}")
+
+        checks.append(check_maximum)
+    return checks
+
+
+def compile_array_checks(schema, base_dir, root_schema, memo):
+    checks = []
+    min_items = schema.get("minItems")
+    if min_items is not None:
+        def check_min_items(instance, path, errors):
+            if len(instance) < min_items:
+                errors.append(f"{path}: array has fewer than {min_items} items")
+
+        checks.append(check_min_items)
+    max_items = schema.get("maxItems")
+    if max_items is not None:
+        def check_max_items(instance, path, errors):
+            if len(instance) > max_items:
+                errors.append(f"{path}: array has more than {max_items} items")
+
+        checks.append(check_max_items)
+    if "items" in schema:
+        validate_item = compile_schema(schema["items"], base_dir, root_schema, memo)
+
+        def check_items(instance, path, errors):
+            for idx, item in enumerate(instance):
+                validate_item(item, f"{path}[{idx}]", errors)
+
+        checks.append(check_items)
+    return checks
+
+
+def compile_object_checks(schema, base_dir, root_schema, memo):
+    checks = []
+    required = schema.get("required", [])
+    if required:
+        def check_required(instance, path, errors):
+            for key in required:
+                if key not in instance:
+                    errors.append(f"{path}: missing required property '{key}'")
+
+        checks.append(check_required)
+    properties = {
+        key: compile_schema(value, base_dir, root_schema, memo)
+        for key, value in schema.get("properties", {}).items()
+    }
+    no_additional = schema.get("additionalProperties") is False
+    if properties or no_additional:
+        def check_properties(instance, path, errors):
+            for key, value in instance.items():
+                validate_property = properties.get(key)
+                if validate_property is not None:
+                    validate_property(value, f"{path}.{key}", errors)
+                elif no_additional:
+                    errors.append(f"{path}: additional property '{key}' not allowed")
+
+        checks.append(check_properties)
+    return checks
+
+
+def compile_node(schema, base_dir, root_schema, memo):
+    leading = []
     if "$ref" in schema:
         ref_schema, ref_base, ref_root = resolve_ref(schema["$ref"], base_dir, root_schema)
-        errors.extend(validate(instance, ref_schema, ref_base, ref_root, path))
+        validate_ref = compile_schema(ref_schema, ref_base, ref_root, memo)
+        leading.append(validate_ref)
 
     if "anyOf" in schema:
-        anyof_errors = []
-        for option in schema["anyOf"]:
-            option_errors = validate(instance, option, base_dir, root_schema, path)
-            if not option_errors:
-                anyof_errors = []
-                break
-            anyof_errors.append(option_errors)
-        if anyof_errors:
+        options = [compile_schema(option, base_dir, root_schema, memo) for option in schema["anyOf"]]
+
+        def check_any_of(instance, path, errors):
+            if not options:
+                return
+            for option in options:
+                try:
+                    option(instance, path, FAIL_FAST)
+                except FirstError:
+                    continue
+                return
             errors.append(f"{path}: does not match anyOf options")
 
+        leading.append(check_any_of)
+
+    # A type mismatch stops the remaining checks for this schema.
+    gates = []
     expected_type = schema.get("type")
     if expected_type is not None:
-        if isinstance(expected_type, list):
-            if not any(type_matches(instance, item) for item in expected_type):
-                errors.append(f"{path}: expected type {expected_type}")
-                return errors
-        else:
-            if not type_matches(instance, expected_type):
-                errors.append(f"{path}: expected type {expected_type}")
-                return errors
-
-    if "enum" in schema and instance not in schema["enum"]:
-        errors.append(f"{path}: value {instance!r} not in enum")
-
-    if isinstance(instance, str):
-        min_length = schema.get("minLength")
-        if min_length is not None and len(instance) < min_length:
-            errors.append(f"{path}: string length < {min_length}")
-        pattern = schema.get("pattern")
-        if pattern and re.search(pattern, instance) is None:
-            errors.append(f"{path}: string does not match pattern {pattern!r}")
-
-    if isinstance(instance, (int, float)) and not isinstance(instance, bool):
-        minimum = schema.get("minimum")
-        if minimum is not None and instance < minimum:
-            errors.append(f"{path}: value {instance} < minimum {minimum}")
-        maximum = schema.get("maximum")
-        if maximum is not None and instance > maximum:
-            errors.append(f"{path}: value {instance} > maximum {maximum}")
-
-    if isinstance(instance, list):
-        min_items = schema.get("minItems")
-        if min_items is not None and len(instance) < min_items:
-            errors.append(f"{path}: array has fewer than {min_items} items")
-        max_items = schema.get("maxItems")
-        if max_items is not None and len(instance) > max_items:
-            errors.append(f"{path}: array has more than {max_items} items")
-        if "items" in schema:
-            item_schema = schema["items"]
-            for idx, item in enumerate(instance):
-                errors.extend(validate(item, item_schema, base_dir, root_schema, f"{path}[{idx}]") )
+        gates.append(compile_type_check(expected_type))
+    if "enum" in schema:
+        gates.append(compile_enum_check(schema["enum"]))
+
+    number_checks = compile_number_checks(schema)
+    by_type = {
+        str: compile_string_checks(schema),
+        int: number_checks,
+        float: number_checks,
+        list: compile_array_checks(schema, base_dir, root_schema, memo),
+        dict: compile_object_checks(schema, base_dir, root_schema, memo),
+    }
+    by_type = {kind: checks for kind, checks in by_type.items() if checks}
+
+    def validate_node(instance, path, errors):
+        for check in leading:
+            check(instance, path, errors)
+        for gate in gates:
+            if gate(instance, path, errors):
+                return
+        checks = by_type.get(type(instance))
+        if checks:
+            for check in checks:
+                check(instance, path, errors)
+
+    return validate_node
 
-    if isinstance(instance, dict):
-        required = schema.get("required", [])
-        for key in required:
-            if key not in instance:
-                errors.append(f"{path}: missing required property '{key}'")
 
-        properties = schema.get("properties", {})
-        for key, value in instance.items():
-            if key in properties:
-                errors.extend(validate(value, properties[key], base_dir, root_schema, f"{path}.{key}"))
-            elif schema.get("additionalProperties") is False:
-                errors.append(f"{path}: additional property '{key}' not allowed")
+# Compiles a schema into fn(instance, path, errors). $ref targets are resolved
+# once here; memo shares compiled nodes between references and breaks cycles.
+def compile_schema(schema, base_dir, root_schema, memo=None):
+    if memo is None:
+        memo = {}
+    key = id(schema)
+    compiled = memo.get(key)
+    if compiled is not None:
+        return compiled
+    cell = []
+    memo[key] = lambda instance, path, errors: cell[0](instance, path, errors)
+    compiled = compile_node(schema, base_dir, root_schema, memo)
+    cell.append(compiled)
+    memo[key] = compiled
+    return compiled
 
+
+def validate(instance, schema, base_dir, root_schema, path="$"):
+    errors = []
+    compile_schema(schema, base_dir, root_schema)(instance, path, errors)
     return errors
 
 
-def validate_file(schema_path, data_path):
+def format_jsonschema_errors(validator_errors):
+    errors = []
+    for error in sorted(validator_errors, key=str):
+        path = "$"
+        if error.path:
+            path = "$" + "".join([f"[{repr(p)}]" if isinstance(p, int) else f".{p}" for p in error.path])
+        errors.append(f"{path}: {error.message}")
+    return errors
+
+
+def build_jsonschema_validator(schema_path):
     schema = load_json(schema_path)
-    data = load_json(data_path)
+    Draft7Validator.check_schema(schema)
+    base_uri = Path(schema_path).resolve().as_uri()
+    resolver = RefResolver(base_uri=base_uri, referrer=schema, store={})
+    validator = Draft7Validator(schema, resolver=resolver, format_checker=None)
+    return lambda data: format_jsonschema_errors(validator.iter_errors(data))
 
-    if Draft7Validator is not None:
-        base_uri = Path(schema_path).resolve().as_uri()
-        resolver = RefResolver(base_uri=base_uri, referrer=schema)
-        validator = Draft7Validator(schema, resolver=resolver)
+
+def build_fallback_validator(schema_path):
+    schema = load_json(schema_path)
+    validate_root = compile_schema(schema, os.path.dirname(schema_path), schema)
+
+    def run(data):
         errors = []
-        for error in sorted(validator.iter_errors(data), key=str):
-            path = "$"
-            if error.path:
-                path = "$" + "".join([f"[{repr(p)}]" if isinstance(p, int) else f".{p}" for p in error.path])
-            errors.append(f"{path}: {error.message}")
+        validate_root(data, "$", errors)
         return errors
 
-    base_dir = os.path.dirname(schema_path)
-    errors = validate(data, schema, base_dir, schema)
-    return errors
+    return run
+
+
+# Pick the implementation once at import instead of branching per schema.
+build_full_validator = build_jsonschema_validator if Draft7Validator is not None else build_fallback_validator
+
+
+def load_file_uri(uri):
+    return load_json(url2pathname(urlparse(uri).path))
+
+
+def build_fast_check(schema_path):
+    schema = load_json(schema_path)
+    # $id anchors relative $refs such as ./_defs.json to the schema's own directory.
+    schema.setdefault("$id", Path(schema_path).resolve().as_uri())
+    try:
+        return fastjsonschema.compile(
+            schema,
+            handlers={"file": load_file_uri},
+            use_default=False,
+            use_formats=False,
+            detailed_exceptions=False,
+        )
+    except Exception:
+        return None
+
+
+def build_fast_validator(schema_path):
+    validate_full = build_full_validator(schema_path)
+    fast_check = build_fast_check(schema_path)
+    if fast_check is None:
+        return validate_full
+
+    # fastjsonschema only answers valid/invalid; failing documents get the full report.
+    def run(data):
+        try:
+            fast_check(data)
+        except fastjsonschema.JsonSchemaException:
+            return validate_full(data)
+        return []
+
+    return run
+
+
+build_validator = build_fast_validator if fastjsonschema is not None else build_full_validator
+
+
+def get_validator(schema_path):
+    real_path = os.path.realpath(schema_path)
+    key = (real_path, os.stat(real_path).st_mtime_ns)
+    validator = VALIDATOR_CACHE.get(key)
+    if validator is None:
+        validator = build_validator(schema_path)
+        VALIDATOR_CACHE[key] = validator
+    return validator
+
+
+def validate_file(schema_path, data_path):
+    return get_validator(schema_path)(load_json(data_path))
+
+
+def validate_many(schema_path, data_paths):
+    validator = get_validator(schema_path)
+    return {data_path: validator(load_json(data_path)) for data_path in data_paths}
 
 
 def main():
-    if len(sys.argv) != 3:
-        print("Usage: schema_validate.py <schema.json> <data.json>")
+    if len(sys.argv) < 3:
+        print("Usage: schema_validate.py <schema.json> <data.json> [<data.json> ...]")
         sys.exit(1)
-    schema_path, data_path = sys.argv[1:3]
-    errors = validate_file(schema_path, data_path)
+    schema_path, data_paths = sys.argv[1], sys.argv[2:]
+    results = validate_many(schema_path, data_paths)
+    errors = []
+    for data_path, data_errors in results.items():
+        prefix = f"{data_path}: " if len(data_paths) > 1 else ""
+        errors.extend(f"{prefix}{err}" for err in data_errors)
     if errors:
         print("Schema validation failed:")
         for err in errors:
@@ -3,8 +3,16 @@ import re
 import unicodedata
 
 ANCHOR_RE = re.compile(r"^<a id=\"(SECTION_[A-Z0-9_]+)\"></a>$")
+# Substring test that rules out almost every line before ANCHOR_RE runs.
+ANCHOR_PREFIX = '<a id="SECTION_'
 HEADING_RE = re.compile(r"^(#{1,6})\s+(.+?)\s*$")
-SECTION_REF_RE = re.compile(r"SECTION_[A-Z0-9_]+")
+SECTION_REF_RE = re.compile(r"SECTION_[A-Z0-9_]+", re.ASCII)
+NON_ALNUM_RE = re.compile(r"[^A-Za-z0-9]+")
+# One pass over a file: group 1 is a whole-line anchor id, group 2 any other SECTION ref.
+SECTION_SCAN_RE = re.compile(
+    r"^[^\S\n]*<a id=\"(SECTION_[A-Z0-9_]+)\"></a>[^\S\n]*$|(SECTION_[A-Z0-9_]+)",
+    re.MULTILINE,
+)
 
 FILE_PREFIXES = {
     "00-gate.md": "GATE",
@@ -24,18 +32,55 @@ def file_prefix(file_path):
     if base in FILE_PREFIXES:
         return FILE_PREFIXES[base]
     stem = os.path.splitext(base)[0]
-    stem = re.sub(r"^\d+[-_]*", "", stem)
+    stem = strip_number_prefix(stem)
     return slugify_heading(stem)
 
 
+def strip_number_prefix(text):
+    # Equivalent to re.sub(r"^\d+[-_]*", "", text).
+    end = len(text)
+    idx = 0
+    while idx < end and text[idx].isdecimal():
+        idx += 1
+    if idx == 0:
+        return text
+    while idx < end and text[idx] in "-_":
+        idx += 1
+    return text[idx:]
+
+
+def heading_prefix_end(text):
+    # Length of a leading r"(?:[IVX]+|\d+)(?:-[A-Z])?\.\s+" match, or 0 when absent.
+    end = len(text)
+    idx = 0
+    if end and text[0] in "IVX":
+        while idx < end and text[idx] in "IVX":
+            idx += 1
+    else:
+        while idx < end and text[idx].isdecimal():
+            idx += 1
+    if idx == 0:
+        return 0
+    if idx + 1 < end and text[idx] == "-" and "A" <= text[idx + 1] <= "Z":
+        idx += 2
+    if idx >= end or text[idx] != ".":
+        return 0
+    idx += 1
+    start = idx
+    while idx < end and text[idx].isspace():
+        idx += 1
+    return idx if idx > start else 0
+
+
 def strip_heading_prefix(text):
-    return re.sub(r"^(?:[IVX]+|\d+)(?:-[A-Z])?\.\s+", "", text.strip())
+    text = text.strip()
+    return text[heading_prefix_end(text):]
 
 
 def slugify_heading(text):
     text = strip_heading_prefix(text)
     text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
-    cleaned = re.sub(r"[^A-Za-z0-9]+", " ", text)
+    cleaned = NON_ALNUM_RE.sub(" ", text)
     tokens = cleaned.split()
     merged = []
     buffer = ""
@@ -79,10 +124,25 @@ def extract_section_refs(text):
     return SECTION_REF_RE.findall(text)
 
 
+def scan_anchors_and_refs(text):
+    anchors = []
+    refs = []
+    for match in SECTION_SCAN_RE.finditer(text):
+        anchor_id = match.group(1)
+        if anchor_id:
+            anchors.append(anchor_id)
+            refs.append(anchor_id)
+        else:
+            refs.append(match.group(2))
+    return anchors, refs
+
+
 def is_anchor_line(line):
+    if ANCHOR_PREFIX not in line:
+        return None
     return ANCHOR_RE.match(line.strip())
 
 
 def get_anchor_id(line):
-    match = ANCHOR_RE.match(line.strip())
+    match = is_anchor_line(line)
     return match.group(1) if match else None
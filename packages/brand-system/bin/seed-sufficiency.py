@@ -1,30 +1,40 @@
 #!/usr/bin/env python3
-import json
 import os
 import sys
 from pathlib import Path
 
-PLACEHOLDER_VALUES = {
+from _jsonio import load_json_cached
+
+PLACEHOLDER_VALUES = frozenset({
     "TODO",
     "TBD",
     "REPLACE_ME",
     "YYYY-MM-DD",
     "YYYY-MM-DDTHH:MM:SSZ",
-}
+})
+PLACEHOLDER_FIRST_CHARS = frozenset(value[0] for value in PLACEHOLDER_VALUES)
 
 ROOT_DIR = Path(__file__).resolve().parents[1]
+MISSING = object()
 
-def load_json(path):
-    with open(path, "r", encoding="utf-8") as handle:
-        return json.load(handle)
+def compile_requirements(mapping):
+    return [
+        (
+            requirement.get("output", "(unknown output)"),
+            [(path, tuple(path.split("."))) for path in requirement.get("required_seed_paths", [])],
+        )
+        for requirement in mapping.get("requirements", [])
+    ]
 
 
-def get_value(data, path):
+def get_value(data, parts):
     current = data
-    for part in path.split("."):
-        if not isinstance(current, dict) or part not in current:
+    for part in parts:
+        if not isinstance(current, dict):
+            return None, False
+        current = current.get(part, MISSING)
+        if current is MISSING:
             return None, False
-        current = current[part]
     return current, True
 
 
@@ -32,38 +42,43 @@ def is_placeholder(value):
     if value is None:
         return True
     if isinstance(value, str):
-        if not value.strip():
+        # Most values can be ruled out from their first character alone.
+        head = value[:1]
+        if head and not head.isspace() and head.upper()[:1] not in PLACEHOLDER_FIRST_CHARS:
+            return False
+        stripped = value.strip()
+        if not stripped:
             return True
-        return value.strip().upper() in PLACEHOLDER_VALUES
+        return stripped.upper() in PLACEHOLDER_VALUES
     return False
 
 
-def main():
-    os.chdir(ROOT_DIR)
-    seed_path = sys.argv[1] if len(sys.argv) > 1 else "brand-seed.json"
-    map_path = sys.argv[2] if len(sys.argv) > 2 else "registry/seed-sufficiency-map.json"
-
+def check_seed_sufficiency(seed_path="brand-seed.json", map_path="registry/seed-sufficiency-map.json"):
     if not os.path.exists(seed_path):
-        print(f"Missing seed file: {seed_path}")
-        sys.exit(1)
+        return [f"Missing seed file: {seed_path}"]
     if not os.path.exists(map_path):
-        print(f"Missing seed sufficiency map: {map_path}")
-        sys.exit(1)
+        return [f"Missing seed sufficiency map: {map_path}"]
 
-    seed = load_json(seed_path)
-    mapping = load_json(map_path)
+    seed = load_json_cached(seed_path)
+    mapping = load_json_cached(map_path)
 
     errors = []
-    for requirement in mapping.get("requirements", []):
-        output = requirement.get("output", "(unknown output)")
-        for path in requirement.get("required_seed_paths", []):
-            value, found = get_value(seed, path)
+    for output, paths in compile_requirements(mapping):
+        for path, parts in paths:
+            value, found = get_value(seed, parts)
             if not found:
                 errors.append(f"{output}: missing seed field {path}")
                 continue
             if is_placeholder(value):
                 errors.append(f"{output}: seed field {path} is placeholder")
+    return errors
 
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    os.chdir(ROOT_DIR)
+    errors = check_seed_sufficiency(*argv[:2])
     if errors:
         print("Seed sufficiency check failed:")
         for err in errors:
@@ -1,8 +1,13 @@
 #!/usr/bin/env python3
-import json
+import argparse
 import os
+import sys
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from _jsonio import dump_json, load_json, load_json_cached, save_json_if_changed
+
 ROOT_DIR = Path(__file__).resolve().parents[1]
 
 MAPPINGS = {
@@ -31,40 +36,62 @@ MAPPINGS = {
 }
 
 
-def load_json(path: Path):
-    with path.open("r", encoding="utf-8") as handle:
-        return json.load(handle)
-
-
-def extract_ids(registry_path: Path, list_key: str):
-    data = load_json(registry_path)
+def extract_ids(registry_path: Path, list_key: str, data=None):
+    if data is None:
+        data = load_json_cached(registry_path)
     items = data.get(list_key, [])
     ids = [item.get("id") for item in items if isinstance(item, dict) and item.get("id")]
     if not ids:
         raise ValueError(f"No IDs found in {registry_path} for key '{list_key}'")
     if len(ids) != len(set(ids)):
-        duplicates = sorted({item for item in ids if ids.count(item) > 1})
+        duplicates = sorted(item for item, count in Counter(ids).items() if count > 1)
         raise ValueError(f"Duplicate IDs in {registry_path}: {', '.join(duplicates)}")
     return ids
 
 
-def main():
-    os.chdir(ROOT_DIR)
-    defs_path = ROOT_DIR / "schemas" / "_defs.json"
-    defs = load_json(defs_path)
+def build_defs(defs, root=ROOT_DIR):
     definitions = defs.get("definitions", {})
 
-    for def_name, (registry_file, list_key) in MAPPINGS.items():
-        registry_path = ROOT_DIR / registry_file
-        ids = extract_ids(registry_path, list_key)
+    registry_paths = [root / registry_file for registry_file, _ in MAPPINGS.values()]
+    # The registries are small, so open/read latency dominates; overlap it.
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        registries = list(executor.map(load_json_cached, registry_paths))
+
+    for (def_name, (_, list_key)), registry_path, registry in zip(MAPPINGS.items(), registry_paths, registries):
+        ids = extract_ids(registry_path, list_key, registry)
         definition = definitions.get(def_name, {})
         definition["type"] = "string"
         definition["enum"] = ids
         definitions[def_name] = definition
 
     defs["definitions"] = definitions
-    defs_path.write_text(json.dumps(defs, indent=2) + "\n")
-    print("Synced schemas/_defs.json enums from registries.")
+    return defs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="exit non-zero if schemas/_defs.json is out of sync instead of rewriting it",
+    )
+    args = parser.parse_args(argv)
+
+    os.chdir(ROOT_DIR)
+    defs_path = ROOT_DIR / "schemas" / "_defs.json"
+    defs = build_defs(load_json(defs_path))
+
+    if args.check:
+        if defs_path.read_bytes() != dump_json(defs):
+            print("schemas/_defs.json is out of sync with registries. Run defs:sync.")
+            sys.exit(1)
+        print("schemas/_defs.json is in sync with registries.")
+        return
+
+    if save_json_if_changed(defs_path, defs):
+        print("Synced schemas/_defs.json enums from registries.")
+    else:
+        print("schemas/_defs.json already in sync with registries.")
 
 
 if __name__ == "__main__":
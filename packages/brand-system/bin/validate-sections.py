@@ -1,70 +1,76 @@
 #!/usr/bin/env python3
-import json
 import os
 import sys
-from glob import glob
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-from section_utils import extract_section_refs, get_anchor_id, is_anchor_line
+from _jsonio import load_json
+from section_utils import scan_anchors_and_refs
 
 ROOT_DIR = Path(__file__).resolve().parents[1]
-
-
-def load_registry(path):
-    with open(path, "r", encoding="utf-8") as handle:
-        return json.load(handle)
-
-
-def collect_anchor_ids(doc_paths):
+SCAN_EXTENSIONS = (".md", ".json")
+PRUNED_DIRS = frozenset({"node_modules", "dist", "build", "__pycache__"})
+
+
+def iter_scan_paths(root="."):
+    # Like the recursive globs it replaces, hidden files and directories are skipped.
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [name for name in dirnames if not name.startswith(".") and name not in PRUNED_DIRS]
+        rel_dir = os.path.relpath(dirpath, root)
+        for name in filenames:
+            if name.endswith(SCAN_EXTENSIONS) and not name.startswith("."):
+                yield name if rel_dir == "." else os.path.join(rel_dir, name)
+
+
+def scan_file(path):
+    with open(path, "rb") as handle:
+        data = handle.read()
+    # Most scanned files never mention a section; skip decoding and the regex for them.
+    if b"SECTION_" not in data:
+        return [], []
+    content = data.decode("utf-8")
+    if "\r" in content:
+        content = content.replace("\r\n", "\n").replace("\r", "\n")
+    return scan_anchors_and_refs(content)
+
+
+def scan_files(scan_paths, doc_paths):
+    doc_set = set(doc_paths)
     anchors_by_file = {}
-    for path in doc_paths:
-        with open(path, "r", encoding="utf-8") as handle:
-            anchors = []
-            for line in handle:
-                if not is_anchor_line(line):
-                    continue
-                anchor_id = get_anchor_id(line)
-                if anchor_id:
-                    anchors.append(anchor_id)
-            anchors_by_file[path] = anchors
-    return anchors_by_file
-
-
-def collect_section_refs(paths):
     refs = {}
-    for path in paths:
-        with open(path, "r", encoding="utf-8") as handle:
-            content = handle.read()
-        matches = extract_section_refs(content)
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as executor:
+        results = list(executor.map(scan_file, scan_paths))
+    for path, (anchors, matches) in zip(scan_paths, results):
+        if path in doc_set:
+            anchors_by_file[path] = anchors
         if matches:
             refs[path] = matches
-    return refs
+    return anchors_by_file, refs
 
 
-def main():
-    os.chdir(ROOT_DIR)
+def check_sections():
     registry_path = "registry/sections.json"
     if not os.path.exists(registry_path):
-        print("Missing registry/sections.json")
-        sys.exit(1)
+        return ["Missing registry/sections.json"]
 
-    registry = load_registry(registry_path)
+    registry = load_json(registry_path)
     sections = registry.get("sections", [])
     ids = [entry.get("id") for entry in sections if entry.get("id")]
-    duplicates = sorted({item for item in ids if ids.count(item) > 1})
+    duplicates = []
+    if len(ids) != len(set(ids)):
+        duplicates = sorted(item for item, count in Counter(ids).items() if count > 1)
 
     id_to_file = {entry["id"]: entry["file"] for entry in sections if "id" in entry and "file" in entry}
     valid_ids = set(id_to_file.keys())
 
-    doc_paths = sorted(glob("docs/*.md"))
-    anchor_ids_by_file = collect_anchor_ids(doc_paths)
+    scan_paths = sorted(iter_scan_paths())
+    doc_paths = [path for path in scan_paths if os.path.dirname(path) == "docs" and path.endswith(".md")]
+    anchor_ids_by_file, refs_by_file = scan_files(scan_paths, doc_paths)
     anchor_ids = set()
     for anchor_list in anchor_ids_by_file.values():
         anchor_ids.update(anchor_list)
 
-    scan_paths = sorted(glob("**/*.md", recursive=True) + glob("**/*.json", recursive=True))
-    refs_by_file = collect_section_refs(scan_paths)
-
     errors = []
 
     if duplicates:
@@ -89,7 +95,12 @@ def main():
     orphan_anchors = sorted(anchor_ids - valid_ids)
     if orphan_anchors:
         errors.append("Anchor IDs missing from registry:\n  " + "\n  ".join(orphan_anchors))
+    return errors
 
+
+def main():
+    os.chdir(ROOT_DIR)
+    errors = check_sections()
     if errors:
         print("Section validation failed:")
         for entry in errors:
@@ -3,32 +3,41 @@ import os
 import sys
 from pathlib import Path
 
-from schema_validate import load_json, validate_file
+from schema_validate import get_validator, load_json
 
-PLACEHOLDER_VALUES = {
+PLACEHOLDER_VALUES = frozenset({
     "TODO",
     "TBD",
     "REPLACE_ME",
     "YYYY-MM-DD",
     "YYYY-MM-DDTHH:MM:SSZ",
-}
+})
+PLACEHOLDER_FIRST_CHARS = frozenset(value[0] for value in PLACEHOLDER_VALUES)
 
 ROOT_DIR = Path(__file__).resolve().parents[1]
 
+def format_path(root, parts):
+    return root + "".join(f"[{part}]" if isinstance(part, int) else f".{part}" for part in parts)
+
+
 def find_placeholders(value, path):
+    # Paths are carried as tuples and only formatted for reported placeholders.
     issues = []
-    if isinstance(value, dict):
-        for key, item in value.items():
-            issues.extend(find_placeholders(item, f"{path}.{key}"))
-        return issues
-    if isinstance(value, list):
-        for idx, item in enumerate(value):
-            issues.extend(find_placeholders(item, f"{path}[{idx}]"))
-        return issues
-    if isinstance(value, str):
-        normalized = value.strip().upper()
-        if normalized in PLACEHOLDER_VALUES:
-            issues.append(f"{path}: placeholder '{value}'")
+    stack = [(value, ())]
+    while stack:
+        item, parts = stack.pop()
+        kind = type(item)
+        if kind is dict:
+            stack.extend((child, parts + (key,)) for key, child in reversed(item.items()))
+        elif kind is list:
+            stack.extend((item[idx], parts + (idx,)) for idx in range(len(item) - 1, -1, -1))
+        elif kind is str:
+            # Every placeholder starts with one of a few letters once stripped and uppercased.
+            head = item[:1]
+            if not head.isspace() and head.upper()[:1] not in PLACEHOLDER_FIRST_CHARS:
+                continue
+            if item.strip().upper() in PLACEHOLDER_VALUES:
+                issues.append(f"{format_path(path, parts)}: placeholder '{item}'")
     return issues
 
 
@@ -44,14 +53,14 @@ def main():
         print(f"Missing schema file: {schema_path}")
         sys.exit(1)
 
-    errors = validate_file(schema_path, seed_path)
+    data = load_json(seed_path)
+    errors = get_validator(schema_path)(data)
     if errors:
         print("Schema validation failed:")
         for err in errors:
             print(f"- {err}")
         sys.exit(1)
 
-    data = load_json(seed_path)
     placeholders = find_placeholders(data, "$")
     if placeholders:
         print("Placeholder values detected:")
@@ -1,11 +1,16 @@
 #!/usr/bin/env python3
+import functools
 import os
-import subprocess
 import sys
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
-from schema_validate import validate_file, load_json
+from _jsonio import load_json_cached
+from _scripts import load_script
+from schema_validate import get_validator
 
-ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+BIN_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BIN_DIR)
 PLACEHOLDER_VALUES = {
     "TODO",
     "TBD",
@@ -13,6 +18,8 @@ PLACEHOLDER_VALUES = {
     "YYYY-MM-DD",
     "YYYY-MM-DDTHH:MM:SSZ",
 }
+PLACEHOLDER_LENGTHS = frozenset(len(value) for value in PLACEHOLDER_VALUES)
+PLACEHOLDER_LIMIT = 50
 
 
 DEFS_REGISTRY_MAP = {
@@ -43,27 +50,27 @@ DEFS_REGISTRY_MAP = {
 
 
 def extract_registry_ids(registry_path, list_key, errors):
-    if not os.path.exists(registry_path):
+    if not path_exists(registry_path):
         errors.append(f"Missing registry for defs sync: {registry_path}")
         return []
-    data = load_json(registry_path)
+    data = load_json_cached(registry_path)
     items = data.get(list_key, [])
     ids = [item.get("id") for item in items if isinstance(item, dict) and item.get("id")]
     if not ids:
         errors.append(f"No IDs found in {registry_path} for key '{list_key}'")
         return []
     if len(ids) != len(set(ids)):
-        duplicates = sorted({item for item in ids if ids.count(item) > 1})
+        duplicates = sorted(item for item, count in Counter(ids).items() if count > 1)
         errors.append(f"Duplicate IDs in {registry_path}: {', '.join(duplicates)}")
     return ids
 
 
 def validate_defs_sync(errors):
     defs_path = resolve_path("schemas/_defs.json")
-    if not os.path.exists(defs_path):
+    if not path_exists(defs_path):
         errors.append("Missing schemas/_defs.json for defs sync")
         return
-    defs = load_json(defs_path)
+    defs = load_json_cached(defs_path)
     definitions = defs.get("definitions", {})
     for def_name, (registry_rel, list_key) in DEFS_REGISTRY_MAP.items():
         registry_path = resolve_path(registry_rel)
@@ -89,31 +96,55 @@ def validate_defs_sync(errors):
             errors.append(
                 f"schemas/_defs.json '{def_name}' out of sync with {registry_rel} ({', '.join(details)})"
             )
+@functools.lru_cache(maxsize=1024)
 def resolve_path(path):
     return os.path.join(ROOT_DIR, path)
 
 
-def validate_manifest_entry(entry, errors):
-    path = resolve_path(entry["path"])
-    if not os.path.exists(path):
+# Manifest entries share schemas and expected outputs are checked twice, so
+# each path is stat'ed once per run; main clears the cache on entry.
+@functools.lru_cache(maxsize=None)
+def stat_path(path):
+    try:
+        return os.stat(path)
+    except (OSError, ValueError):
+        return None
+
+
+def path_exists(path):
+    return stat_path(path) is not None
+
+
+MANIFEST_SECTIONS = ("required_files", "optional_files", "expected_outputs")
+
+
+def prepare_entries(manifest):
+    # Resolve each entry's file and schema path once; the manifest itself may be
+    # a shared cached document, so the results go into tuples instead of the entries.
+    prepared = []
+    for kind in MANIFEST_SECTIONS:
+        for entry in manifest.get(kind, []):
+            schema_path = entry.get("schema")
+            schema_full = resolve_path(schema_path) if schema_path else None
+            prepared.append((kind, entry, resolve_path(entry["path"]), schema_full))
+    return prepared
+
+
+def validate_manifest_entry(entry, path, schema_full, errors):
+    if not path_exists(path):
         errors.append(f"Missing required file: {entry['path']}")
         return
 
     schema_path = entry.get("schema")
     if schema_path and entry.get("validate", True):
-        schema_full = resolve_path(schema_path)
-        if not os.path.exists(schema_full):
+        if not path_exists(schema_full):
             errors.append(f"Missing schema: {schema_path} (for {entry['path']})")
             return
-        schema_errors = validate_file(schema_full, path)
-        for err in schema_errors:
-            errors.append(f"{entry['path']}: {err}")
+        return schema_full
 
 
-def validate_optional_entry(entry, warnings, errors, required_key=False):
-    path = resolve_path(entry["path"])
-    exists = os.path.exists(path)
-    if not exists:
+def validate_optional_entry(entry, path, schema_full, warnings, errors, required_key=False):
+    if not path_exists(path):
         if required_key:
             errors.append(f"Missing expected output: {entry['path']}")
         else:
@@ -122,157 +153,208 @@ def validate_optional_entry(entry, warnings, errors, required_key=False):
 
     schema_path = entry.get("schema")
     if schema_path:
-        schema_full = resolve_path(schema_path)
-        if not os.path.exists(schema_full):
+        if not path_exists(schema_full):
             warnings.append(f"Missing schema: {schema_path} (for {entry['path']})")
             return
-        schema_errors = validate_file(schema_full, path)
-        for err in schema_errors:
-            errors.append(f"{entry['path']}: {err}")
+        return schema_full
+
+
+def validate_schema_group(schema_full, group):
+    validator = get_validator(schema_full)
+    documents = {}
+    for entry, path, entry_errors in group:
+        data = load_json_cached(path)
+        documents[path] = data
+        schema_errors = validator(data)
+        entry_errors.extend(f"{entry['path']}: {err}" for err in schema_errors)
+    return documents
+
+
+def validate_schema_groups(pending):
+    # Entries sharing a schema are validated back to back against one compiled validator.
+    groups = defaultdict(list)
+    for schema_full, entry, path, entry_errors in pending:
+        groups[schema_full].append((entry, path, entry_errors))
+    documents = {}
+    if not groups:
+        return documents
+    # Groups run concurrently but each stays on one thread: a jsonschema
+    # validator's RefResolver keeps a scope stack and is not thread-safe.
+    with ThreadPoolExecutor(max_workers=min(len(groups), os.cpu_count() or 1)) as executor:
+        for group_documents in executor.map(validate_schema_group, groups.keys(), groups.values()):
+            documents.update(group_documents)
+    return documents
 
 
 def load_section_ids(errors):
     registry_path = resolve_path("registry/sections.json")
-    if not os.path.exists(registry_path):
+    if not path_exists(registry_path):
         errors.append("Missing registry/sections.json for derivation validation")
-        return set()
-    registry = load_json(registry_path)
-    return {entry.get("id") for entry in registry.get("sections", []) if entry.get("id")}
-
-
-def extract_derivation_logs(value, path="$"):
-    logs = []
-    if isinstance(value, dict):
-        if "derivation_log" in value and isinstance(value["derivation_log"], dict):
-            logs.append((f"{path}.derivation_log", value["derivation_log"]))
-        for key, item in value.items():
-            logs.extend(extract_derivation_logs(item, f"{path}.{key}"))
-        return logs
-    if isinstance(value, list):
-        for idx, item in enumerate(value):
-            logs.extend(extract_derivation_logs(item, f"{path}[{idx}]"))
-    return logs
+        return frozenset()
+    registry = load_json_cached(registry_path)
+    section_ids = (entry.get("id") for entry in registry.get("sections", []))
+    return frozenset(
+        sys.intern(section_id) if isinstance(section_id, str) else section_id
+        for section_id in section_ids
+        if section_id
+    )
 
 
 def is_placeholder(value):
     if value is None:
         return True
     if isinstance(value, str):
-        if not value.strip():
+        stripped = value.strip()
+        if not stripped:
             return True
-        return value.strip().upper() in PLACEHOLDER_VALUES
+        # upper() keeps the length of ASCII text, so other lengths cannot match;
+        # non-ASCII text can grow when uppercased ("ß" -> "SS") and takes the full check.
+        if len(stripped) not in PLACEHOLDER_LENGTHS and stripped.isascii():
+            return False
+        return stripped.upper() in PLACEHOLDER_VALUES
     return False
 
 
-def collect_placeholders(value, path="$"):
-    matches = []
-    if isinstance(value, dict):
-        for key, item in value.items():
-            matches.extend(collect_placeholders(item, f"{path}.{key}"))
-    elif isinstance(value, list):
-        for idx, item in enumerate(value):
-            matches.extend(collect_placeholders(item, f"{path}[{idx}]"))
-    else:
-        if is_placeholder(value):
-            matches.append(path)
-    return matches
+def format_path(parts):
+    return "$" + "".join(f"[{part}]" if isinstance(part, int) else f".{part}" for part in parts)
 
 
-def validate_derivation_log_refs(data, section_ids, errors, file_label):
-    logs = extract_derivation_logs(data)
+def scan_output(data, placeholder_limit=PLACEHOLDER_LIMIT):
+    # One pre-order walk collects derivation logs and placeholder leaves; paths
+    # stay as tuples and are only formatted when an error is reported. Parsed
+    # JSON only holds plain dicts and lists, so exact type checks are enough.
+    logs = []
+    placeholders = []
+    stack = [(data, ())]
+    while stack:
+        value, parts = stack.pop()
+        kind = type(value)
+        if kind is dict:
+            log = value.get("derivation_log")
+            if type(log) is dict:
+                logs.append((parts + ("derivation_log",), log))
+            stack.extend((item, parts + (key,)) for key, item in reversed(value.items()))
+        elif kind is list:
+            if any(type(item) is dict or type(item) is list for item in value):
+                stack.extend((value[idx], parts + (idx,)) for idx in range(len(value) - 1, -1, -1))
+                continue
+            # A list of scalars holds no derivation logs; check its leaves here instead of
+            # pushing each one. Mixed lists take the stack path above to keep pre-order.
+            for idx, item in enumerate(value):
+                if is_placeholder(item):
+                    placeholders.append(parts + (idx,))
+                    if len(placeholders) > placeholder_limit:
+                        break
+            if len(placeholders) > placeholder_limit:
+                break
+        elif is_placeholder(value):
+            placeholders.append(parts)
+            # One past the limit is enough to know the report is truncated; stop walking there.
+            if len(placeholders) > placeholder_limit:
+                break
+    return logs, placeholders
+
+
+def validate_derivation_log_refs(logs, section_ids, errors, file_label, complete=True):
     if not logs:
-        errors.append(f"{file_label}: missing derivation_log")
+        if complete:
+            errors.append(f"{file_label}: missing derivation_log")
         return
-    for path, log in logs:
-        source_sections = log.get("source_sections", [])
-        for idx, section_id in enumerate(source_sections):
-            if section_id not in section_ids:
-                errors.append(f"{file_label}: {path}.source_sections[{idx}] unknown section {section_id}")
-        chain = log.get("chain", [])
+    for parts, log in logs:
+        path = None
+        source_sections = log.get("source_sections") or ()
+        # The common case is every ref known; one C-level subset test confirms it
+        # and only a failing list is walked for indexes.
+        if not section_ids.issuperset(source_sections):
+            for idx, section_id in enumerate(source_sections):
+                if section_id not in section_ids:
+                    path = path or format_path(parts)
+                    errors.append(f"{file_label}: {path}.source_sections[{idx}] unknown section {section_id}")
+        chain = log.get("chain") or ()
         for chain_idx, link in enumerate(chain):
-            derived_from = link.get("derived_from", [])
+            derived_from = link.get("derived_from") or ()
+            if section_ids.issuperset(derived_from):
+                continue
             for ref_idx, section_id in enumerate(derived_from):
                 if section_id not in section_ids:
+                    path = path or format_path(parts)
                     errors.append(
                         f"{file_label}: {path}.chain[{chain_idx}].derived_from[{ref_idx}] unknown section {section_id}"
                     )
 
 
 def run_section_validation(errors):
-    result = subprocess.run(
-        [sys.executable, os.path.join(os.path.dirname(__file__), "validate-sections.py")],
-        capture_output=True,
-        text=True,
-        cwd=ROOT_DIR,
-    )
-    if result.returncode != 0:
+    section_errors = load_script("validate-sections").check_sections()
+    if section_errors:
         errors.append("Section validation failed")
-        output = (result.stdout + result.stderr).strip()
-        if output:
-            errors.append(output)
-
-
+        errors.extend(section_errors)
 
 
-def run_consistency_validation(errors):
-    result = subprocess.run(
-        [sys.executable, os.path.join(os.path.dirname(__file__), "validate-consistency.py")],
-        capture_output=True,
-        text=True,
-        cwd=ROOT_DIR,
-    )
-    if result.returncode != 0:
-        errors.append("Consistency validation failed")
-        output = (result.stdout + result.stderr).strip()
-        if output:
-            errors.append(output)
 def run_seed_sufficiency(errors):
-    result = subprocess.run(
-        [sys.executable, os.path.join(os.path.dirname(__file__), "seed-sufficiency.py")],
-        capture_output=True,
-        text=True,
-        cwd=ROOT_DIR,
+    sufficiency_errors = load_script("seed-sufficiency").check_seed_sufficiency(
+        resolve_path("brand-seed.json"), resolve_path("registry/seed-sufficiency-map.json")
     )
-    if result.returncode != 0:
+    if sufficiency_errors:
         errors.append("Seed sufficiency check failed")
-        output = (result.stdout + result.stderr).strip()
-        if output:
-            errors.append(output)
+        errors.extend(sufficiency_errors)
 
 
 def main():
     os.chdir(ROOT_DIR)
+    stat_path.cache_clear()
     manifest_path = resolve_path("registry/system-manifest.json")
-    if not os.path.exists(manifest_path):
+    if not path_exists(manifest_path):
         print("Missing registry/system-manifest.json")
         sys.exit(1)
 
-    manifest = load_json(manifest_path)
+    manifest = load_json_cached(manifest_path)
     errors = []
     warnings = []
 
-    for entry in manifest.get("required_files", []):
-        validate_manifest_entry(entry, errors)
-
-    for entry in manifest.get("optional_files", []):
-        validate_optional_entry(entry, warnings, errors, required_key=False)
+    # Each entry collects into its own lists so grouped schema errors still
+    # come out in manifest order.
+    prepared = prepare_entries(manifest)
+    results = []
+    pending = []
+    for kind, entry, path, schema_full in prepared:
+        entry_warnings = []
+        entry_errors = []
+        if kind == "required_files":
+            validate_schema = validate_manifest_entry(entry, path, schema_full, entry_errors)
+        else:
+            required = kind == "expected_outputs" and entry.get("required", False)
+            validate_schema = validate_optional_entry(
+                entry, path, schema_full, entry_warnings, entry_errors, required_key=required
+            )
+        results.append((entry_warnings, entry_errors))
+        if validate_schema:
+            pending.append((schema_full, entry, path, entry_errors))
 
-    for entry in manifest.get("expected_outputs", []):
-        required = entry.get("required", False)
-        validate_optional_entry(entry, warnings, errors, required_key=required)
+    # Parsed documents are handed back so the output scan below reuses them.
+    documents = validate_schema_groups(pending)
+    for entry_warnings, entry_errors in results:
+        warnings.extend(entry_warnings)
+        errors.extend(entry_errors)
 
     section_ids = load_section_ids(errors)
-    for entry in manifest.get("expected_outputs", []):
-        output_path = resolve_path(entry["path"])
-        if not os.path.exists(output_path):
+    for kind, entry, output_path, _ in prepared:
+        if kind != "expected_outputs" or not path_exists(output_path):
             continue
-        data = load_json(output_path)
-        validate_derivation_log_refs(data, section_ids, errors, entry["path"])
-        placeholders = collect_placeholders(data)
-        if placeholders:
-            for placeholder_path in placeholders:
-                errors.append(f"{entry['path']}: placeholder value at {placeholder_path}")
-
+        # Schema validation above already needed the whole document; streaming the
+        # file here would only add a second parse.
+        data = documents.get(output_path)
+        if data is None:
+            data = load_json_cached(output_path)
+        logs, placeholders = scan_output(data)
+        truncated = len(placeholders) > PLACEHOLDER_LIMIT
+        # A truncated walk may have stopped before reaching the derivation logs.
+        validate_derivation_log_refs(logs, section_ids, errors, entry["path"], complete=not truncated)
+        for parts in placeholders[:PLACEHOLDER_LIMIT]:
+            errors.append(f"{entry['path']}: placeholder value at {format_path(parts)}")
+        if truncated:
+            errors.append(f"{entry['path']}: more placeholder values omitted after the first {PLACEHOLDER_LIMIT}")
+
+    # Run in this process so they share its JSON cache instead of re-parsing in a new interpreter.
     run_section_validation(errors)
     run_seed_sufficiency(errors)
 